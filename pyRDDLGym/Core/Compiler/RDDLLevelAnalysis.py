@@ -1,4 +1,4 @@
-from typing import Dict, Set
+from typing import Dict, List, Set
 import warnings
 
 from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLInvalidDependencyInCPFError
@@ -184,7 +184,7 @@ class RDDLLevelAnalysis:
     # topological sort
     # ===========================================================================
     
-    def compute_levels(self) -> Dict[int, Set[str]]:
+    def compute_levels(self) -> Dict[int, List[str]]:
         '''Constructs a call graph for the current RDDL, and then runs a 
         topological sort to determine the optimal order in which the CPFs in the 
         RDDL should be be evaluated.
@@ -206,6 +206,10 @@ class RDDLLevelAnalysis:
                 result.setdefault(level, set()).add(var)
                 levels[var] = level
         
+        # CPFs within a level are sorted so the evaluation order (and hence the
+        # compiled program) does not depend on the string hash seed
+        result = {level: sorted(cpfs) for (level, cpfs) in result.items()}
+        
         # log dependency graph information to file
         if self.logger is not None: 
             graph_info = '\n\t'.join(f"{rddl.variable_types[k]} {k}: "
@@ -162,13 +162,12 @@ class RDDLLiftedModel(PlanningModel):
         states, statesranges, nextstates, prevstates = {}, {}, {}, {}
         for pvar in self._AST.domain.pvariables:
             if pvar.is_state_fluent():
-                name, ptypes = pvar.name, pvar.param_types
+                name = pvar.name
                 statesranges[name] = pvar.range
                 nextstates[name] = name + PRIME
                 prevstates[name + PRIME] = name
                 default = self._extract_default_value(pvar)              
-                states[name] = {gname: default 
-                                for gname in self.ground_names(name, ptypes)} 
+                states[name] = dict.fromkeys(self.grounded_names[name], default)
                 
         # update the state values with the values in the instance
         initstates = copy.deepcopy(states)
@@ -267,10 +266,9 @@ class RDDLLiftedModel(PlanningModel):
         non_fluents = {}
         for pvar in self._AST.domain.pvariables:
             if pvar.is_non_fluent():
-                name, ptypes = pvar.name, pvar.param_types
+                name = pvar.name
                 default = self._extract_default_value(pvar)      
-                non_fluents[name] = {gname: default
-                                     for gname in self.ground_names(name, ptypes)}
+                non_fluents[name] = dict.fromkeys(self.grounded_names[name], default)
         
         # update non-fluent values with the values in the instance
         non_fluent_info = getattr(self._AST.non_fluents, 'init_non_fluent', [])
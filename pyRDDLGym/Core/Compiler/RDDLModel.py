@@ -1,7 +1,7 @@
 from abc import ABCMeta
 import itertools
 import numpy as np
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLInvalidNumberOfArgumentsError
 from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLInvalidObjectError
@@ -508,14 +508,33 @@ class PlanningModel(metaclass=ABCMeta):
         '''
         index_of_obj = self.index_of_object
         try:
-            return tuple(index_of_obj[obj] for obj in objects)
+            return tuple(map(index_of_obj.__getitem__, objects))
         except:
-            for obj in objects:
-                if obj not in index_of_obj:
-                    raise RDDLInvalidObjectError(
-                        f'Object <{obj}> is not valid, '
-                        f'must be one of {set(index_of_obj.keys())}.'
-                        f'\n{msg}')
+            self._check_objects(objects, msg)
+    
+    def indices_array(self, objects: Sequence[str], msg: str='') -> np.ndarray:
+        '''Returns the canonical indices of a sequence of objects as an integer
+        numpy array, suitable for indexing value tensors with many objects at once
+        
+        :param objects: object instances corresponding to valid types defined
+        in the RDDL domain
+        :param msg: an error message to print in case the conversion fails.
+        '''
+        index_of_obj = self.index_of_object
+        try:
+            return np.fromiter(map(index_of_obj.__getitem__, objects),
+                               dtype=np.int64, count=len(objects))
+        except:
+            self._check_objects(objects, msg)
+    
+    def _check_objects(self, objects, msg):
+        index_of_obj = self.index_of_object
+        for obj in objects:
+            if obj not in index_of_obj:
+                raise RDDLInvalidObjectError(
+                    f'Object <{obj}> is not valid, '
+                    f'must be one of {set(index_of_obj.keys())}.'
+                    f'\n{msg}')
     
     def object_counts(self, types: Iterable[str], msg: str='') -> Tuple[int, ...]:
         '''Returns a tuple containing the number of objects of each type.
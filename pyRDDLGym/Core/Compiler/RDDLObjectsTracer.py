@@ -1,5 +1,5 @@
 import numpy as np
-from typing import List, Tuple, Union
+from typing import Iterable, List, Tuple, Union
 
 from pyRDDLGym.Core.ErrorHandling.RDDLException import print_stack_trace
 from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLInvalidNumberOfArgumentsError
@@ -51,6 +51,10 @@ class RDDLTracedObjects:
         '''Returns compiled info that is specific to the expression.'''
         return self._cached_sim_info[expr.id]
     
+    def expressions(self) -> Iterable[Expression]:
+        '''Returns all expressions that have been traced.'''
+        return self._expr_from_id.values()
+    
     def lookup(self, identifier: int) -> Expression:
         '''Returns the expression with given identifier, or None if does not 
         exist.'''
@@ -192,9 +196,12 @@ class RDDLObjectsTracer:
     # ===========================================================================
     
     def _trace_constant(self, expr, objects, out):
+        
+        # constants in scope of free variables are read-only broadcast views
+        # of a single value, so they occupy no memory regardless of the shape
         if objects:
             shape = self.rddl.object_counts((ptype for (_, ptype) in objects))
-            cached_value = np.full(shape=shape, fill_value=expr.args)
+            cached_value = np.broadcast_to(expr.args, shape=shape)
         else:
             cached_value = expr.args
             
@@ -242,11 +249,11 @@ class RDDLObjectsTracer:
                     f'Object <{var}> must be of a domain-defined object type, '
                     f'got type <{enum_type}>.')
             
-            # map to canonical index - for pvariable fill an array with it
+            # map to canonical index - for pvariable broadcast it to a view
             const = rddl.index_of_object[literal]
             if objects:
                 shape = rddl.object_counts((ptype for (_, ptype) in objects))
-                cached_value = np.full(shape=shape, fill_value=const)
+                cached_value = np.broadcast_to(const, shape=shape)
             else:
                 cached_value = const            
             cached_value = (True, cached_value)
@@ -404,8 +411,10 @@ class RDDLObjectsTracer:
         # 2. broadcast new axes to the desired shape (# of objects of each type)
         # 3. rearrange the axes as needed to match the desired variables in order
         #    3a. in most cases, it suffices to use np.transform (cheaper)
-        #    3b. in cases where we have a more complex contraction like 
-        #        fluent(?x) = matrix(?x, ?x), we will use np.einsum
+        #    3b. in cases where we have a more complex contraction like
+        #        fluent(?x) = matrix(?x, ?x), we will use np.einsum, and steps
+        #        1-2 are folded into the einsum by passing a vector of ones
+        #        for each new axis, so the broadcast value is never materialized
         if nested:
             new_axis = None
             new_shape = None
@@ -423,8 +432,13 @@ class RDDLObjectsTracer:
             new_shape = tuple(object_shape[i] for i in permuted)
             objects_range = list(range(len(objects)))        
             if len(covered) != len_after_slice:
-                op_args = (permuted, objects_range)
+                op_args = [permuted[:len_after_slice]]
+                for i in permuted[len_after_slice:]:
+                    op_args.extend((np.ones(object_shape[i], dtype=bool), [i]))
+                op_args.append(objects_range)
+                op_args = tuple(op_args)
                 op_code = RDDLObjectsTracer.NUMPY_OP_CODE.EINSUM
+                new_axis = new_shape = ()
             elif permuted != objects_range:
                 op_args = tuple(np.argsort(permuted))  # inverse permutation
                 op_code = RDDLObjectsTracer.NUMPY_OP_CODE.TRANSPOSE
@@ -28,7 +28,8 @@ class RDDLValueInitializer:
         'bool': False
     }
         
-    def __init__(self, rddl: PlanningModel, logger: Logger=None) -> None:
+    def __init__(self, rddl: PlanningModel, logger: Logger=None,
+                 int_dtype: type=INT, real_dtype: type=REAL) -> None:
         '''Creates a new object to compile initial values from a RDDL file. 
         Initial values of parameterized variables are stored in numpy arrays.
         For a variable var(?x1, ?x2, ... ?xn), the numpy array has n dimensions, 
@@ -37,9 +38,16 @@ class RDDLValueInitializer:
         
         :param rddl: the RDDL file whose initial values to extract
         :param logger: to log information about initial values to file
+        :param int_dtype: the numpy type of int-valued and object-valued tensors
+        :param real_dtype: the numpy type of real-valued tensors
         '''
         self.rddl = rddl
         self.logger = logger
+        self.NUMPY_TYPES = {
+            'int': np.dtype(int_dtype).type,
+            'real': np.dtype(real_dtype).type,
+            'bool': bool
+        }
     
     def initialize(self) -> Dict[str, Union[np.ndarray, INT, REAL, bool]]:
         '''Compiles all initial values of all variables for the current RDDL file.
@@ -70,7 +78,7 @@ class RDDLValueInitializer:
             
             # get default value and dtype
             default = RDDLValueInitializer.DEFAULT_VALUES.get(prange, None)
-            dtype = RDDLValueInitializer.NUMPY_TYPES.get(prange, None)
+            dtype = self.NUMPY_TYPES.get(prange, None)
             if default is None or dtype is None:
                 raise RDDLTypeError(
                     f'Type <{prange}> of variable <{var}> is not valid, '
@@ -79,17 +87,23 @@ class RDDLValueInitializer:
                     f'{set(RDDLValueInitializer.DEFAULT_VALUES.keys())}.')
             
             # scalar value is just cast to the desired type
-            # list values are converted to numpy arrays and reshaped such that 
+            # list values are converted to numpy arrays and reshaped such that
             # number of axes matches number of pvariable arguments
+            # if some values are missing, the tensor is filled with the default
+            # of the range and only the assigned values are scattered into it
             ptypes = rddl.param_types[var]
             if ptypes:
                 shape = rddl.object_counts(ptypes)
+                values = np.full(shape=shape, fill_value=default, dtype=dtype)
                 if var in init_values:
-                    values = [(default if v is None else v) for v in init_values[var]]
-                    values = np.asarray(values, dtype=dtype)
-                    values = np.reshape(values, newshape=shape, order='C')
-                else:
-                    values = np.full(shape=shape, fill_value=default, dtype=dtype)
+                    assigned = init_values[var]
+                    if None in assigned:
+                        indices = [i for (i, v) in enumerate(assigned)
+                                   if v is not None]
+                        values.flat[indices] = [assigned[i] for i in indices]
+                    else:
+                        values = np.asarray(assigned, dtype=dtype)
+                        values = np.reshape(values, newshape=shape, order='C')
             else:
                 values = dtype(init_values.get(var, default))   
             np_init_values[var] = values
@@ -111,15 +125,21 @@ class RDDLValueInitializer:
         is_scalar = isinstance(literals, str)
         if is_scalar:
             literals = [literals]
-            
-        indices = [0] * len(literals)
-        for (i, obj) in enumerate(literals):
-            if obj is not None:
-                if self.rddl.objects_rev.get(obj, None) != prange:
-                    raise RDDLInvalidObjectError(
-                        f'<{obj}> assigned to pvariable <{var}> in instance '
-                        f'is not an object of type <{prange}>.')
-                indices[i] = self.rddl.index_of_object[obj]
+        
+        # check all objects are of the correct type
+        objects = self.rddl.objects[prange]
+        unique = set(literals)
+        invalid = unique.difference(objects, (None,))
+        if invalid:
+            obj = next(obj for obj in literals if obj in invalid)
+            raise RDDLInvalidObjectError(
+                f'<{obj}> assigned to pvariable <{var}> in instance '
+                f'is not an object of type <{prange}>.')
+        
+        # missing objects are assigned the first object of the type
+        if None in unique:
+            literals = [(objects[0] if obj is None else obj) for obj in literals]
+        indices = self.rddl.indices_array(literals)
                 
         if is_scalar:
             indices, = indices
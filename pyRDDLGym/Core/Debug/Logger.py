@@ -1,22 +1,42 @@
 import datetime
+import weakref
 
 
 class Logger:
-    '''Provides functionality for writing messages to a log file.'''
+    '''Provides functionality for writing messages to a log file. The file is
+    kept open between messages, and is flushed on close, at exit or when the
+    logger is garbage collected.'''
     
     def __init__(self, filename: str) -> None:
         self.filename = filename
+        self._fp = None
+        self._finalizer = None
     
+    def _open(self, mode):
+        
+        # the finalizer only references the file, so the logger can be collected
+        self._fp = open(self.filename, mode)
+        self._finalizer = weakref.finalize(self, self._fp.close)
+        
     def clear(self) -> None:
-        fp = open(self.filename, 'w')
-        fp.write('')
-        fp.close()
+        self.close()
+        self._open('w')
     
     def log(self, msg: str) -> None:
-        fp = open(self.filename, 'a')
+        if self._fp is None:
+            self._open('a')
         timestamp = str(datetime.datetime.now())
-        fp.write(f'{timestamp}: {msg}\n')
-        fp.close()
+        self._fp.write(f'{timestamp}: {msg}\n')
+    
+    def flush(self) -> None:
+        if self._fp is not None:
+            self._fp.flush()
+    
+    def close(self) -> None:
+        if self._fp is not None:
+            self._finalizer()
+            self._fp = None
+            self._finalizer = None
     
         
 class SimLogger:
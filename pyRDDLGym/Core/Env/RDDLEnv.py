@@ -2,7 +2,6 @@ import copy
 import gym
 from gym.spaces import Discrete, Dict, Box
 import numpy as np
-import pygame
 import os
 
 from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLInvalidNumberOfArgumentsError
@@ -87,6 +86,8 @@ class RDDLEnv(gym.Env):
         # define the model sampler and bounds    
         self.sampler = backend(self.model, logger=logger)
         bounds = RDDLConstraints(self.sampler).bounds
+        if logger is not None:
+            logger.flush()
 
         # set roll-out parameters
         self.horizon = self.model.horizon
@@ -256,6 +257,7 @@ class RDDLEnv(gym.Env):
         return obs
 
     def pilImageToSurface(self, pilImage):
+        import pygame
         return pygame.image.fromstring(
             pilImage.tobytes(), pilImage.size, pilImage.mode).convert()
 
@@ -263,6 +265,9 @@ class RDDLEnv(gym.Env):
         if self._visualizer is not None:
             image = self._visualizer.render(self.state)
             if to_display:
+                
+                # pygame is only loaded once a window is needed
+                import pygame
                 if not self.to_render:
                     self.to_render = True
                     pygame.init()
@@ -281,8 +286,12 @@ class RDDLEnv(gym.Env):
     def close(self):
         if self.simlogger:
             self.simlogger.close()
+        
+        if self.sampler.logger is not None:
+            self.sampler.logger.close()
                         
         if self.to_render:
+            import pygame
             pygame.display.quit()
             pygame.quit()
     
@@ -3,8 +3,10 @@ import jax
 import jax.numpy as jnp
 import jax.random as random
 import jax.scipy as scipy 
+import numpy as np
 from tensorflow_probability.substrates import jax as tfp
 from typing import Callable, Dict, List
+import warnings
 
 from pyRDDLGym.Core.ErrorHandling.RDDLException import print_stack_trace
 from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLInvalidNumberOfArgumentsError
@@ -27,7 +29,8 @@ class JaxRDDLCompiler:
     def __init__(self, rddl: RDDLLiftedModel,
                  allow_synchronous_state: bool=True,
                  logger: Logger=None,
-                 use64bit: bool=False) -> None:
+                 use64bit: bool=False,
+                 compilation_cache_dir: str=None) -> None:
         '''Creates a new RDDL to Jax compiler.
         
         :param rddl: the RDDL model to compile into Jax
@@ -35,6 +38,15 @@ class JaxRDDLCompiler:
         on each other
         :param logger: to log information about compilation to file
         :param use64bit: whether to use 64 bit arithmetic
+        :param compilation_cache_dir: if specified, a directory where XLA 
+        executables are persisted and reused across runs; entries are keyed by
+        the lowered program, so they are invalidated whenever the domain, 
+        instance, precision or Jax version changes; note that this updates the
+        process-wide Jax config, so the cache applies to every later Jax
+        compilation, and entries of every size are cached (which also disables
+        the filesystem-specific overrides of the minimum entry size in Jax);
+        requires a Jax version with the persistent cache config options, 
+        otherwise a warning is issued and no cache is used
         '''
         self.rddl = rddl
         self.logger = logger
@@ -47,6 +59,8 @@ class JaxRDDLCompiler:
         else:
             self.INT = jnp.int32
             self.REAL = jnp.float32
+        if compilation_cache_dir is not None:
+            self._enable_compilation_cache(compilation_cache_dir)
         self.ONE = jnp.asarray(1, dtype=self.INT)
         self.JAX_TYPES = {
             'int': self.INT,
@@ -57,7 +71,9 @@ class JaxRDDLCompiler:
         # compile initial values
         if self.logger is not None:
             self.logger.clear()
-        initializer = RDDLValueInitializer(rddl, logger=self.logger)
+        initializer = RDDLValueInitializer(rddl, logger=self.logger,
+                                           int_dtype=self.INT,
+                                           real_dtype=self.REAL)
         self.init_values = initializer.initialize()
         
         # compute dependency graph for CPFs and sort them by evaluation order
@@ -135,6 +151,30 @@ class JaxRDDLCompiler:
             'hypot': lambda x, y, param: jnp.hypot(x, y)
         }
         
+    @staticmethod
+    def _enable_compilation_cache(cache_dir):
+        from jax.experimental.compilation_cache import compilation_cache
+        
+        # the persistent cache options only exist in newer versions of Jax
+        options = ('jax_compilation_cache_dir',
+                   'jax_persistent_cache_min_entry_size_bytes',
+                   'jax_persistent_cache_min_compile_time_secs')
+        if not hasattr(compilation_cache, 'reset_cache') \
+        or not all(hasattr(jax.config, option) for option in options):
+            warnings.warn(
+                f'Persistent compilation cache is not supported by '
+                f'Jax {jax.__version__}, compilation_cache_dir is ignored.',
+                stacklevel=3)
+            return
+        
+        if cache_dir != jax.config.jax_compilation_cache_dir:
+            jax.config.update('jax_compilation_cache_dir', cache_dir)
+            jax.config.update('jax_persistent_cache_min_entry_size_bytes', -1)
+            jax.config.update('jax_persistent_cache_min_compile_time_secs', 0)
+            
+            # Jax binds the cache on its first compilation, so rebind it here
+            compilation_cache.reset_cache()
+        
     # ===========================================================================
     # main compilation subroutines
     # ===========================================================================
@@ -194,6 +234,82 @@ class JaxRDDLCompiler:
     def _compile_reward(self, info):
         return self._jax(self.rddl.reward, info, dtype=self.REAL)
     
+    def compile_transition(self, check_constraints: bool=False) -> Callable:
+        '''Compiles the current RDDL into a wrapped function that samples the
+        next state for a given action. The wrapped function takes an RNG key,
+        the action dict, the current subs dict and the model parameters as
+        input, and returns a dictionary of logged information from the step and
+        the new subs dict. The log contains the reward, one error code per
+        expression in order of evaluation (preconditions, CPFs, reward,
+        invariants, terminations) and one boolean flag per precondition,
+        invariant and termination.
+        
+        :param check_constraints: whether state, action and termination
+        conditions should be evaluated: if False, their flags are empty and
+        no error codes are logged for them
+        '''
+        rddl = self.rddl
+        reward_fn, cpfs = self.reward, self.cpfs
+        preconds, invariants, terminals = \
+            self.preconditions, self.invariants, self.termination
+        if not check_constraints:
+            preconds, invariants, terminals = [], [], []
+        num_keys = len(preconds) + len(cpfs) + 1 + len(invariants) + len(terminals)
+        
+        def _jax_wrapped_constraints(constraints, subs, model_params, keys):
+            samples, errors = [], []
+            for (constraint, key) in zip(constraints, keys):
+                sample, _, err = constraint(subs, model_params, key)
+                samples.append(sample)
+                errors.append(err)
+            samples = jnp.asarray(samples, dtype=bool)
+            return samples, errors
+        
+        def _jax_wrapped_single_step(key, actions, subs, model_params):
+            subs = {**subs, **actions}
+            
+            # split all keys needed for this step at once, so that expressions
+            # do not depend on one another through the key
+            keys = iter(random.split(key, num=num_keys))
+            
+            # check action preconditions
+            precond_check, errors = _jax_wrapped_constraints(
+                preconds, subs, model_params, keys)
+            
+            # calculate CPFs in topological order
+            for (name, cpf) in cpfs.items():
+                subs[name], _, err = cpf(subs, model_params, next(keys))
+                errors.append(err)
+            
+            # calculate the immediate reward
+            reward, _, err = reward_fn(subs, model_params, next(keys))
+            errors.append(err)
+            
+            # set the next state to the current state
+            for (state, next_state) in rddl.next_state.items():
+                subs[state] = subs[next_state]
+            
+            # check the state invariants
+            invariant_check, err = _jax_wrapped_constraints(
+                invariants, subs, model_params, keys)
+            errors.extend(err)
+            
+            # check the termination (TODO: zero out reward in s if terminated)
+            terminated_check, err = _jax_wrapped_constraints(
+                terminals, subs, model_params, keys)
+            errors.extend(err)
+            
+            log = {
+                'reward': reward,
+                'error': jnp.asarray(errors),
+                'precondition': precond_check,
+                'invariant': invariant_check,
+                'termination': terminated_check
+            }
+            return log, subs
+        
+        return _jax_wrapped_single_step
+
     def compile_rollouts(self, policy: Callable,
                          n_steps: int, 
                          n_batch: int,
@@ -214,14 +330,11 @@ class JaxRDDLCompiler:
         NORMAL = JaxRDDLCompiler.ERROR_CODES['NORMAL']
         
         rddl = self.rddl
-        reward_fn, cpfs = self.reward, self.cpfs
-        preconds, invariants, terminals = \
-            self.preconditions, self.invariants, self.termination
+        transition_fn = self.compile_transition(check_constraints)
         
         # do a single step update from the RDDL model
         def _jax_wrapped_single_step(key, policy_params, hyperparams, 
                                      step, subs, model_params):
-            errors = NORMAL
             
             # compute action
             key, subkey = random.split(key)
@@ -229,53 +342,19 @@ class JaxRDDLCompiler:
                       for (var, values) in subs.items()
                       if rddl.variable_types[var] == 'state-fluent'}
             actions = policy(subkey, policy_params, hyperparams, step, states)
-            subs.update(actions)
-            
-            # check action preconditions
-            precond_check = True
-            if check_constraints:
-                for precond in preconds:
-                    sample, key, err = precond(subs, model_params, key)
-                    precond_check = jnp.logical_and(precond_check, sample)
-                    errors |= err
-            
-            # calculate CPFs in topological order
-            for (name, cpf) in cpfs.items():
-                subs[name], key, err = cpf(subs, model_params, key)
-                errors |= err                
-                
-            # calculate the immediate reward
-            reward, key, err = reward_fn(subs, model_params, key)
-            errors |= err
-            
-            # set the next state to the current state
-            for (state, next_state) in rddl.next_state.items():
-                subs[state] = subs[next_state]
-            
-            # check the state invariants
-            invariant_check = True
-            if check_constraints:
-                for invariant in invariants:
-                    sample, key, err = invariant(subs, model_params, key)
-                    invariant_check = jnp.logical_and(invariant_check, sample)
-                    errors |= err
-            
-            # check the termination (TODO: zero out reward in s if terminated)
-            terminated_check = False
-            if check_constraints:
-                for terminal in terminals:
-                    sample, key, err = terminal(subs, model_params, key)
-                    terminated_check = jnp.logical_or(terminated_check, sample)
-                    errors |= err
             
+            # sample the next state and reduce the constraint checks
+            log, subs = transition_fn(key, actions, subs, model_params)
+            errors = log['error']
             log = {
                 'pvar': subs,
                 'action': actions,
-                'reward': reward,
-                'error': errors,
-                'precondition': precond_check,
-                'invariant': invariant_check,
-                'termination': terminated_check
+                'reward': log['reward'],
+                'error': jax.lax.reduce(errors, jnp.asarray(NORMAL, errors.dtype),
+                                        jax.lax.bitwise_or, (0,)),
+                'precondition': jnp.all(log['precondition']),
+                'invariant': jnp.all(log['invariant']),
+                'termination': jnp.any(log['termination'])
             }
             return log, subs
         
@@ -513,6 +592,21 @@ class JaxRDDLCompiler:
         NORMAL = JaxRDDLCompiler.ERROR_CODES['NORMAL']
         cached_value = self.traced.cached_sim_info(expr)
         
+        # tensor constants are cast to the compiler precision up front
+        # broadcast views of a single value stay views: only the value is cast
+        if isinstance(cached_value, np.ndarray):
+            dtype = None
+            if np.issubdtype(cached_value.dtype, np.floating):
+                dtype = self.REAL
+            elif np.issubdtype(cached_value.dtype, np.integer):
+                dtype = self.INT
+            if dtype is not None:
+                if cached_value.size and not any(cached_value.strides):
+                    value = np.asarray(cached_value.flat[0], dtype=dtype)
+                    cached_value = np.broadcast_to(value, cached_value.shape)
+                else:
+                    cached_value = cached_value.astype(dtype)
+        
         def _jax_wrapped_constant(x, params, key):
             sample = jnp.asarray(cached_value)
             return sample, key, NORMAL
@@ -1,9 +1,11 @@
 import jax
+import jax.numpy as jnp
 import numpy as np
 np.seterr(all='raise')
-from typing import Dict
+from typing import Dict, NamedTuple, Tuple
 
 from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLActionPreconditionNotSatisfiedError
+from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLInvalidActionError
 from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLInvalidExpressionError
 from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLStateInvariantNotSatisfiedError
 
@@ -17,6 +19,16 @@ from pyRDDLGym.Core.Parser.expr import Value
 Args = Dict[str, Value]
 
 
+class JaxRDDLSimState(NamedTuple):
+    '''An immutable snapshot of a Jax simulation, consisting of the values of
+    all fluents and non-fluents (in lifted tensor form) and the PRNG key. Being
+    a tuple, it is a valid Jax PyTree and can be passed through jit, vmap and
+    scan without conversion.'''
+    
+    subs: Dict[str, jnp.ndarray]
+    key: jax.random.PRNGKey
+
+
 class JaxRDDLSimulator(RDDLSimulator):
         
     def __init__(self, rddl: RDDLLiftedModel,
@@ -56,22 +68,39 @@ class JaxRDDLSimulator(RDDLSimulator):
         self.init_values = compiled.init_values
         self.levels = compiled.levels
         self.traced = compiled.traced
+        self.pvar_transforms = self._compile_pvar_transforms()
         
-        self.invariants = jax.tree_map(jax.jit, compiled.invariants)
-        self.preconds = jax.tree_map(jax.jit, compiled.preconditions)
-        self.terminals = jax.tree_map(jax.jit, compiled.termination)
+        self.invariants = compiled.invariants
+        self.preconds = compiled.preconditions
+        self.terminals = compiled.termination
         self.reward = jax.jit(compiled.reward)
-        jax_cpfs = jax.tree_map(jax.jit, compiled.cpfs)
         self.model_params = compiled.model_params
         
-        # level analysis
-        self.cpfs = []  
-        for cpfs in self.levels.values():
-            for cpf in cpfs:
-                expr = jax_cpfs[cpf]
-                prange = rddl.variable_ranges[cpf]
-                dtype = compiled.JAX_TYPES.get(prange, compiled.INT)
-                self.cpfs.append((cpf, expr, dtype))
+        # CPF evaluation plan: the compiled CPFs are already in topological 
+        # order, so they are frozen into a flat tuple of (name, function)
+        self.cpfs = tuple(compiled.cpfs.items())
+        
+        # all constraints are evaluated by one jitted function, so they share a
+        # single executable; the results are copied to the host once per check
+        self.constraints_fn = jax.jit(self._jax_constraints({
+            'invariant': self.invariants,
+            'precondition': self.preconds,
+            'termination': self.terminals
+        }))
+        
+        # CPFs, reward, constraints and termination are traced into one graph
+        # by the compiler, so that a step requires only a single dispatch to XLA
+        step_fn = self._jax_step(compiled.compile_transition(check_constraints=True))
+        self.step_fn = jax.jit(step_fn)
+        self.rollout_fn = jax.jit(self._jax_rollout(step_fn))
+        self.batched_step_fn = jax.jit(
+            jax.vmap(step_fn, in_axes=(0, 0, None)))
+        self.step_error_names = \
+            [f'precondition {i + 1}' for i in range(len(self.preconds))] + \
+            [f'CPF <{cpf}>' for (cpf, _) in self.cpfs] + \
+            ['reward function'] + \
+            [f'invariant {i + 1}' for i in range(len(self.invariants))] + \
+            [f'termination {i + 1}' for i in range(len(self.terminals))]
         
         # initialize all fluent and non-fluent values    
         self.subs = self.init_values.copy() 
@@ -79,7 +108,56 @@ class JaxRDDLSimulator(RDDLSimulator):
         self.noop_actions = {var: values 
                              for (var, values) in self.init_values.items() 
                              if rddl.variable_types[var] == 'action-fluent'}
+        self.action_dtypes = {var: np.result_type(values)
+                              for (var, values) in self.noop_actions.items()}
         self._pomdp = bool(rddl.observ)
+        self._step_flags = None
+        
+    def _jax_constraints(self, groups):
+        num_keys = sum(len(constraints) for constraints in groups.values())
+        
+        def _jax_wrapped_constraints(subs, model_params, key):
+            keys = jax.random.split(key, num_keys + 1)
+            key, keys = keys[0], iter(keys[1:])
+            log = {}
+            for (group, constraints) in groups.items():
+                samples, errors = [], []
+                for constraint in constraints:
+                    sample, _, err = constraint(subs, model_params, next(keys))
+                    samples.append(sample)
+                    errors.append(err)
+                samples = jnp.asarray(samples, dtype=bool)
+                errors = jnp.asarray(errors)
+                log[group] = (samples, errors)
+            return log, key
+        
+        return _jax_wrapped_constraints
+    
+    def _jax_step(self, transition_fn):
+        
+        def _jax_wrapped_step(state, actions, model_params):
+            subs, key = state
+            key, subkey = jax.random.split(key)
+            log, subs = transition_fn(subkey, actions, subs, model_params)
+            log['done'] = jnp.any(log['termination'])
+            return JaxRDDLSimState(subs, key), log
+        
+        return _jax_wrapped_step
+    
+    def _jax_rollout(self, step_fn):
+        
+        def _jax_wrapped_scan_step(carry, actions):
+            state, model_params = carry
+            state, log = step_fn(state, actions, model_params)
+            carry = (state, model_params)
+            return carry, log
+        
+        def _jax_wrapped_rollout(state, actions, model_params):
+            start = (state, model_params)
+            (state, _), log = jax.lax.scan(_jax_wrapped_scan_step, start, actions)
+            return state, log
+        
+        return _jax_wrapped_rollout
         
     def handle_error_code(self, error, msg) -> None:
         if self.raise_error:
@@ -89,38 +167,57 @@ class JaxRDDLSimulator(RDDLSimulator):
                 errors = '\n'.join(f'{i + 1}. {s}' for (i, s) in enumerate(errors))
                 raise RDDLInvalidExpressionError(message + errors)
     
+    def handle_error_codes(self, errors, msgs) -> None:
+        if self.raise_error:
+            errors = np.asarray(errors)
+            if np.any(errors):
+                for (error, msg) in zip(errors, msgs):
+                    self.handle_error_code(error, msg)
+    
+    def _process_actions(self, actions):
+        
+        # actions are cast to the dtype of the compiled state, so that the state
+        # passed to the compiled step and rollout always has the same types
+        actions = super(JaxRDDLSimulator, self)._process_actions(actions)
+        return {var: np.asarray(value, dtype=self.action_dtypes[var])
+                for (var, value) in actions.items()}
+    
+    def _check_constraints(self, group, subs):
+        
+        # the fused step already evaluates invariants and terminations on the 
+        # state it returns, so those flags are reused until the state changes
+        if self._step_flags is not None and self._step_flags[0] is subs:
+            return self._step_flags[1][group]
+        
+        log, self.key = self.constraints_fn(subs, self.model_params, self.key)
+        samples, errors = jax.device_get(log[group])
+        self.handle_error_codes(
+            errors, [f'{group} {i + 1}' for i in range(len(samples))])
+        return samples
+    
     def check_state_invariants(self) -> None:
         '''Throws an exception if the state invariants are not satisfied.'''
-        for (i, invariant) in enumerate(self.invariants):
-            sample, self.key, error = invariant(
-                self.subs, self.model_params, self.key)
-            self.handle_error_code(error, f'invariant {i + 1}')            
-            if not bool(sample):
-                raise RDDLStateInvariantNotSatisfiedError(
-                    f'Invariant {i + 1} is not satisfied.')
+        samples = self._check_constraints('invariant', self.subs)
+        if not np.all(samples):
+            i = np.argmin(samples)
+            raise RDDLStateInvariantNotSatisfiedError(
+                f'Invariant {i + 1} is not satisfied.')
     
     def check_action_preconditions(self, actions: Args) -> None:
         '''Throws an exception if the action preconditions are not satisfied.'''
         actions = self._process_actions(actions)
-        subs = self.subs
-        subs.update(actions)
+        self.subs = subs = {**self.subs, **actions}
         
-        for (i, precond) in enumerate(self.preconds):
-            sample, self.key, error = precond(subs, self.model_params, self.key)
-            self.handle_error_code(error, f'precondition {i + 1}')            
-            if not bool(sample):
-                raise RDDLActionPreconditionNotSatisfiedError(
-                    f'Precondition {i + 1} is not satisfied.')
+        samples = self._check_constraints('precondition', subs)
+        if not np.all(samples):
+            i = np.argmin(samples)
+            raise RDDLActionPreconditionNotSatisfiedError(
+                f'Precondition {i + 1} is not satisfied.')
     
     def check_terminal_states(self) -> bool:
         '''return True if a terminal state has been reached.'''
-        for (i, terminal) in enumerate(self.terminals):
-            sample, self.key, error = terminal(
-                self.subs, self.model_params, self.key)
-            self.handle_error_code(error, f'termination {i + 1}')
-            if bool(sample):
-                return True
-        return False
+        samples = self._check_constraints('termination', self.subs)
+        return bool(np.any(samples))
     
     def sample_reward(self) -> float:
         '''Samples the current reward given the current state and action.'''
@@ -136,31 +233,164 @@ class JaxRDDLSimulator(RDDLSimulator):
         '''
         rddl = self.rddl
         actions = self._process_actions(actions)
-        subs = self.subs
-        subs.update(actions)
-        
-        # compute CPFs in topological order
-        for (cpf, expr, _) in self.cpfs:
-            subs[cpf], self.key, error = expr(subs, self.model_params, self.key)
-            self.handle_error_code(error, f'CPF <{cpf}>')            
-                
-        # sample reward
-        reward = self.sample_reward()
-        
-        # update state
-        self.state = {}
-        for (state, next_state) in rddl.next_state.items():
-            subs[state] = subs[next_state]
-            self.state.update(rddl.ground_values(state, subs[state]))
-        
-        # update observation
+        
+        # compute CPFs, reward and termination in a single compiled step
+        state = JaxRDDLSimState(self.subs, self.key)
+        state, log = self.step_fn(state, actions, self.model_params)
+        log = jax.device_get({key: log[key] for key in 
+                              ('reward', 'done', 'error', 'invariant', 'termination')})
+        self.handle_error_codes(log['error'], self.step_error_names)
+        self.subs, self.key = state
+        self._step_flags = (self.subs, log)
+        reward, done = log['reward'], log['done']
+        
+        # update observation: the grounded state is only computed when it is 
+        # requested by the user or it is the observation
         if self._pomdp: 
-            obs = {}
-            for var in rddl.observ:
-                obs.update(rddl.ground_values(var, subs[var]))
+            self.state = None
+            obs = self._ground(rddl.observ)
+        else:
+            obs = self.state = self._ground(rddl.states)
+        
+        return obs, float(reward), bool(done)
+    
+    def rollout(self, actions: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        '''Simulates a trajectory from the current state with a single compiled
+        loop, and returns the reward and termination flag for each decision epoch.
+        Simulation does not stop when a terminal state is reached, so the caller
+        is responsible for truncating the trajectory at the first termination.
+        Action preconditions and state invariants are checked up to the first 
+        termination, as they would be when stepping through RDDLEnv.
+        
+        :param actions: a dict mapping action fluents (as they appear in RDDL) to 
+        value tensors, whose leading axis is the decision epoch: missing action
+        fluents are assigned their default values at every epoch, and if no 
+        actions are provided then the horizon of the instance is simulated
+        '''
+        if actions:
+            values = next(iter(actions.values()))
+            horizon = jnp.shape(values)[0] if jnp.ndim(values) else 0
         else:
-            obs = self.state
+            horizon = self.rddl.horizon
+        batched_actions = self._batch_actions(actions, horizon)
         
-        done = self.check_terminal_states()        
-        return obs, reward, done
+        # compute trajectory in a single compiled loop
+        state = JaxRDDLSimState(self.subs, self.key)
+        state, log = self.rollout_fn(state, batched_actions, self.model_params)
+        log = jax.device_get(log)
+        self.handle_error_codes(
+            np.bitwise_or.reduce(log['error'], axis=0), self.step_error_names)
+        
+        # constraints are only enforced up to and including the first epoch 
+        # that reaches a terminal state
+        dones = log['done']
+        active = (np.cumsum(dones) - dones) == 0
+        self._check_constraint_flags(log, active, dones, 'decision epoch')
+        self.subs, self.key = state
+        self.state = None
+        
+        return log['reward'], dones
+    
+    def _ground(self, variables):
+        
+        # all tensors are copied from the device in a single transfer
+        values = jax.device_get({var: self.subs[var] for var in variables})
+        grounded = {}
+        for var in variables:
+            grounded.update(self.rddl.ground_values(var, values[var]))
+        return grounded
+    
+    @property
+    def states(self) -> Args:
+        if self.state is None:
+            self.state = self._ground(self.rddl.states)
+        return self.state.copy()
+    
+    def _check_constraint_flags(self, log, active, dones, axis_name):
+        
+        # like RDDLEnv, preconditions are checked on every action taken, and
+        # invariants on every next state that is not terminal
+        failed = np.logical_and(
+            np.logical_not(log['precondition']), active[..., np.newaxis])
+        if np.any(failed):
+            index, i = np.argwhere(failed)[0]
+            raise RDDLActionPreconditionNotSatisfiedError(
+                f'Precondition {i + 1} is not satisfied '
+                f'in {axis_name} {index}.')
+        
+        active = np.logical_and(active, np.logical_not(dones))
+        failed = np.logical_and(
+            np.logical_not(log['invariant']), active[..., np.newaxis])
+        if np.any(failed):
+            index, i = np.argwhere(failed)[0]
+            raise RDDLStateInvariantNotSatisfiedError(
+                f'Invariant {i + 1} is not satisfied '
+                f'in {axis_name} {index}.')
+    
+    def _batch_actions(self, actions, size):
+        for action in actions:
+            if action not in self.noop_actions:
+                raise RDDLInvalidActionError(
+                    f'<{action}> is not a valid action-fluent, '
+                    f'must be one of {set(self.noop_actions.keys())}.')
+        
+        # action fluents are cast to the dtype of the simulator state on the 
+        # device, so that actions computed by a Jax policy are not copied back 
+        # to the host; missing action fluents are filled with their defaults
+        batched_actions = {}
+        for (var, noop) in self.noop_actions.items():
+            shape = (size,) + np.shape(noop)
+            if var in actions:
+                values = jnp.asarray(actions[var], dtype=self.action_dtypes[var])
+                if jnp.shape(values) != shape:
+                    raise RDDLInvalidActionError(
+                        f'Value of action-fluent <{var}> must have shape '
+                        f'{shape}, got {jnp.shape(values)}.')
+            else:
+                values = jnp.broadcast_to(noop, shape)
+            batched_actions[var] = values
+        return batched_actions
+    
+    # ===========================================================================
+    # vectorized simulation of parallel environments
+    # ===========================================================================
+    
+    def batched_reset(self, batch_size: int) -> JaxRDDLSimState:
+        '''Returns the initial state of batch_size parallel environments: the
+        values of all fluents are stacked along a new leading axis, and each
+        environment is assigned an independent PRNG key.
+        
+        :param batch_size: the number of parallel environments
+        '''
+        subs = {var: np.broadcast_to(values, (batch_size,) + np.shape(values))
+                for (var, values) in self.init_values.items()}
+        self.key, subkey = jax.random.split(self.key)
+        keys = jax.random.split(subkey, num=batch_size)
+        return JaxRDDLSimState(subs, keys)
+    
+    def batched_step(self, state: JaxRDDLSimState,
+                     actions: Dict[str, np.ndarray]) -> Tuple[JaxRDDLSimState, jnp.ndarray, jnp.ndarray]:
+        '''Samples the next state of a batch of parallel environments with a 
+        single vectorized call, and returns the next state, rewards and 
+        termination flags, each with a leading batch axis. The given state is 
+        not modified. Action preconditions are checked in every environment, and 
+        state invariants in every environment that did not terminate.
+        
+        :param state: the state of each environment (e.g. as returned by
+        batched_reset), whose leading axis indexes the environment
+        :param actions: a dict mapping action fluents (as they appear in RDDL) to 
+        value tensors, whose leading axis indexes the environment: missing action
+        fluents are assigned their default values in every environment
+        '''
+        actions = self._batch_actions(actions, len(state.key))
+        state, log = self.batched_step_fn(state, actions, self.model_params)
         
+        # error codes and constraint flags are copied to the host together, 
+        # while the state, rewards and termination flags stay on the device
+        flags = jax.device_get({key: log[key] for key in 
+                                ('error', 'precondition', 'invariant', 'done')})
+        self.handle_error_codes(
+            np.bitwise_or.reduce(flags['error'], axis=0), self.step_error_names)
+        active = np.ones(np.shape(flags['done']), dtype=bool)
+        self._check_constraint_flags(flags, active, flags['done'], 'environment')
+        return state, log['reward'], log['done']
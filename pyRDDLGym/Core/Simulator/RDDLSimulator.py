@@ -135,6 +135,9 @@ class RDDLSimulator:
         tracer = RDDLObjectsTracer(rddl, logger=self.logger)
         self.traced = tracer.trace()
         
+        # compile the tensor transformation of each pvariable only once
+        self.pvar_transforms = self._compile_pvar_transforms()
+        
         # initialize all fluent and non-fluent values        
         self.subs = self.init_values.copy()
         self.state = None  
@@ -382,7 +385,7 @@ class RDDLSimulator:
         return self.traced.cached_sim_info(expr)
     
     def _sample_pvar(self, expr, subs):
-        var, args = expr.args
+        var, _ = expr.args
         
         # free variable (e.g., ?x) and object converted to canonical index
         is_value, cached_info = self.traced.cached_sim_info(expr)
@@ -397,24 +400,60 @@ class RDDLSimulator:
                 print_stack_trace(expr))
         
         # lifted domain must slice and/or reshape value tensor
-        if cached_info is not None:
-            slices, axis, shape, op_code, op_args = cached_info
-            if slices: 
-                if op_code == RDDLObjectsTracer.NUMPY_OP_CODE.NESTED_SLICE:
-                    slices = tuple(
-                        (self._sample(arg, subs) if _slice is None else _slice)
-                        for (arg, _slice) in zip(args, slices)
-                    )
-                sample = sample[slices]
-            if axis:
-                sample = np.expand_dims(sample, axis=axis)
-                sample = np.broadcast_to(sample, shape=shape)
-            if op_code == RDDLObjectsTracer.NUMPY_OP_CODE.EINSUM:
-                sample = np.einsum(sample, *op_args)
-            elif op_code == RDDLObjectsTracer.NUMPY_OP_CODE.TRANSPOSE:
-                sample = np.transpose(sample, axes=op_args)
+        transform = self.pvar_transforms[expr.id]
+        if transform is not None:
+            sample = transform(sample, subs)
         return sample
     
+    def _compile_pvar_transforms(self):
+        return {expr.id: self._compile_pvar_transform(expr)
+                for expr in self.traced.expressions()
+                if expr.etype[0] == 'pvar'}
+        
+    def _compile_pvar_transform(self, expr):
+        _, args = expr.args
+        is_value, cached_info = self.traced.cached_sim_info(expr)
+        if is_value or cached_info is None:
+            return None
+        
+        slices, axis, shape, op_code, op_args = cached_info
+        
+        # nested pvariables are sliced by values only known at run time
+        if slices and op_code == RDDLObjectsTracer.NUMPY_OP_CODE.NESTED_SLICE:
+            
+            def _transform_nested_slice(sample, subs):
+                new_slices = tuple(
+                    (self._sample(arg, subs) if _slice is None else _slice)
+                    for (arg, _slice) in zip(args, slices)
+                )
+                return sample[new_slices]
+            
+            return _transform_nested_slice
+        
+        # otherwise chain only the operations required by this pvariable
+        ops = []
+        if slices:
+            ops.append(lambda sample, _: sample[slices])
+        if axis:
+            ops.append(lambda sample, _: np.broadcast_to(
+                np.expand_dims(sample, axis=axis), shape=shape))
+        if op_code == RDDLObjectsTracer.NUMPY_OP_CODE.EINSUM:
+            ops.append(lambda sample, _: np.einsum(sample, *op_args))
+        elif op_code == RDDLObjectsTracer.NUMPY_OP_CODE.TRANSPOSE:
+            ops.append(lambda sample, _: np.transpose(sample, axes=op_args))
+        
+        if not ops:
+            return None
+        elif len(ops) == 1:
+            return ops[0]
+        
+        def _transform_chain(sample, subs):
+            for op in ops:
+                sample = op(sample, subs)
+            return sample
+        
+        return _transform_chain
+    
     # ===========================================================================
     # arithmetic
     # ===========================================================================
@@ -1,7 +1,7 @@
 import configparser
 import csv
+import importlib
 import os
-import re
 
 from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLEnvironmentNotExist, RDDLInstanceNotExist
 # from pyRDDLGym.Examples.InstanceGenerators.UAVInstanceGenerator import UAVInstanceGenerator
@@ -65,6 +65,7 @@ if __name__ == '__main__':
 class ExampleManager:
     
     EXP_DICT = load()
+    VIZ_CACHE = {}
     
     def __init__(self, env: str):
         self.env = env
@@ -85,12 +86,8 @@ class ExampleManager:
 
     def list_instances(self):
         files = os.listdir(self.path_to_env)
-        instances = []
-        for file in files:
-            x = re.search("instance\d+.*", file)
-            if x is not None:
-                instances.append(file)
-        return instances
+        return [file for file in files 
+                if file.startswith('instance') and file[8:9].isdigit()]
 
     def get_instance(self, num: int):
         instance = f'instance{num}.rddl'
@@ -101,13 +98,15 @@ class ExampleManager:
         return self.path_to_env + instance
 
     def get_visualizer(self):
-        viz = None
-        viz_info = ExampleManager.EXP_DICT[self.env]['viz']
-        if viz_info:
-            module, viz_class_name = viz_info.strip().split('.')
-            viz_package_name = 'pyRDDLGym.Visualizer.' + module
-            viz_package = __import__(viz_package_name, {}, {}, viz_class_name)
-            viz = getattr(viz_package, viz_class_name)
+        viz = ExampleManager.VIZ_CACHE.get(self.env, None)
+        if viz is None:
+            viz_info = ExampleManager.EXP_DICT[self.env]['viz']
+            if viz_info:
+                module, viz_class_name = viz_info.strip().split('.')
+                viz_package = importlib.import_module(
+                    'pyRDDLGym.Visualizer.' + module)
+                viz = getattr(viz_package, viz_class_name)
+                ExampleManager.VIZ_CACHE[self.env] = viz
         return viz
 
     def generate_instance(self, name, params, path=None):
@@ -119,8 +118,8 @@ class ExampleManager:
             return None
 
         module, generator_class_name = generator_info.strip().split('.')
-        generator_package_name = 'pyRDDLGym.Examples.InstanceGenerators.' + module
-        generator_package = __import__(generator_package_name, {}, {}, generator_class_name)
+        generator_package = importlib.import_module(
+            'pyRDDLGym.Examples.InstanceGenerators.' + module)
         generator = getattr(generator_package, generator_class_name)
 
         generator = generator()
@@ -141,6 +140,7 @@ class ExampleManager:
     def RebuildExamples():
         rebuild()
         ExampleManager.EXP_DICT = load()
+        ExampleManager.VIZ_CACHE = {}
         ExampleManager.ListExamples()
         
     @staticmethod
@@ -1,4 +1,4 @@
-import random
+import numpy as np
 from typing import Dict
 
 from pyRDDLGym.Examples.InstanceGenerator import InstanceGenerator
@@ -23,23 +23,19 @@ class HVACInstanceGenerator(InstanceGenerator):
         nonfluents = {}
         nonfluents['TEMP-ZONE-MIN'] = params['TEMP-ZONE-MIN']
         nonfluents['TEMP-ZONE-MAX'] = params['TEMP-ZONE-MAX']
-        zones_to_switch = list(range(nz))
-        random.shuffle(zones_to_switch)
-        for i in zones_to_switch[:params['p-switch-number']]:
-            z = obj_zones[i]
-            nonfluents[f'P-SWITCH({z})'] = params['p-switch-prob']
-        for h, h2z in zip(obj_heaters, heaters):
-            for z in h2z:
-                nonfluents[f'ADJ-HEATER({h}, {obj_zones[z]})'] = True
-        for z, z2z in zip(obj_zones, zones):
-            for z2 in z2z:
-                nonfluents[f'ADJ-ZONES({z}, {obj_zones[z2]})'] = True
+        num_switch = min(params['p-switch-number'], nz)
+        for i in np.random.choice(nz, size=num_switch, replace=False):
+            nonfluents[f'P-SWITCH({obj_zones[i]})'] = params['p-switch-prob']
+        for h, z in np.argwhere(heaters):
+            nonfluents[f'ADJ-HEATER({obj_heaters[h]}, {obj_zones[z]})'] = True
+        for z, z2 in np.argwhere(zones):
+            nonfluents[f'ADJ-ZONES({obj_zones[z]}, {obj_zones[z2]})'] = True
         
-        states = {}
-        for i, z in enumerate(obj_zones):
-            states[f'temp-zone({z})'] = random.uniform(*params['temp-zone-range-init'])
-        for i, h in enumerate(obj_heaters):
-            states[f'temp-heater({h})'] = random.uniform(*params['temp-heater-range-init'])
+        temp_zones = np.random.uniform(*params['temp-zone-range-init'], size=nz)
+        temp_heaters = np.random.uniform(*params['temp-heater-range-init'], size=nh)
+        states = {f'temp-zone({z})': t for (z, t) in zip(obj_zones, temp_zones)}
+        states.update({f'temp-heater({h})': t 
+                       for (h, t) in zip(obj_heaters, temp_heaters)})
                 
         return {
             'objects': {'zone': obj_zones, 'heater': obj_heaters},
@@ -51,24 +47,16 @@ class HVACInstanceGenerator(InstanceGenerator):
         }
             
     def _generate_layout(self, nh, nz, density):
-        heaters = [set() for _ in range(nh)]
-        zones = [set() for _ in range(nz)]
+        heaters = np.zeros((nh, nz), dtype=bool)
     
         # Each heater must be connected to at least one zone
-        for h in range(nh):
-            z = random.randrange(nz)
-            heaters[h].add(z)
+        heaters[np.arange(nh), np.random.randint(nz, size=nh)] = True
     
         # Each zone must be connected to at least one heater
-        for z in range(nz):
-            if not any((z in htz) for htz in heaters):
-                h = random.randrange(nh)
-                heaters[h].add(z)
+        uncovered = np.flatnonzero(~np.any(heaters, axis=0))
+        heaters[np.random.randint(nh, size=uncovered.size), uncovered] = True
     
         # Zones can be interconnected
-        for z1 in range(nz):
-            for z2 in range(z1 + 1, nz):
-                if random.random() < density:
-                    zones[z1].add(z2)
+        zones = np.triu(np.random.random((nz, nz)) < density, k=1)
         return heaters, zones
     
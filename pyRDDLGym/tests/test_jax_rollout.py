@@ -0,0 +1,84 @@
+import numpy as np
+
+from pyRDDLGym.Core.Env.RDDLEnv import RDDLEnv
+from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLActionPreconditionNotSatisfiedError
+from pyRDDLGym.Core.ErrorHandling.RDDLException import RDDLInvalidActionError
+from pyRDDLGym.Core.Jax.JaxRDDLSimulator import JaxRDDLSimulator
+from pyRDDLGym.Examples.ExampleManager import ExampleManager
+
+
+def make_env(domain):
+    info = ExampleManager(domain)
+    return RDDLEnv(domain=info.get_domain(), instance=info.get_instance(0),
+                   backend=JaxRDDLSimulator)
+
+
+def test_rollout_after_step():
+
+    # scalar actions given as python ints must not change the rollout carry
+    for domain in ['CartPole_continuous', 'Wildfire']:
+        env = make_env(domain)
+        env.reset()
+        env.step({})
+        rewards, dones = env.sampler.rollout({})
+        assert rewards.shape == dones.shape == (env.horizon,)
+
+
+
+def test_rollout_matches_step():
+    
+    # a compiled rollout must follow the same trajectory as stepping one epoch
+    # at a time from the same state and key
+    for domain in ['CartPole_continuous', 'Elevators', 'RecSim', 'Wildfire']:
+        env = make_env(domain)
+        env.reset()
+        sampler = env.sampler
+        subs, key = sampler.subs, sampler.key
+        rewards = [sampler.step({})[1] for _ in range(env.horizon)]
+        sampler.subs, sampler.key = subs, key
+        rollout_rewards, _ = sampler.rollout({})
+        assert np.allclose(rollout_rewards, rewards), domain
+
+
+def test_rollout_checks_preconditions():
+    env = make_env('Reservoir_continuous')
+    env.reset()
+    sampler = env.sampler
+    
+    # negative release violates a precondition at the last epoch only
+    release = np.zeros((env.horizon,) + np.shape(sampler.noop_actions['release']))
+    release[-1, ...] = -5.0
+    try:
+        sampler.rollout({'release': release})
+        assert False, 'precondition violation was not detected'
+    except RDDLActionPreconditionNotSatisfiedError:
+        pass
+
+
+def test_invalid_batched_actions():
+    env = make_env('CartPole_continuous')
+    env.reset()
+    sampler = env.sampler
+    
+    # unknown action fluents are rejected
+    try:
+        sampler.rollout({'not-an-action': np.zeros(env.horizon)})
+        assert False, 'unknown action was accepted'
+    except RDDLInvalidActionError:
+        pass
+    
+    # leading axis must match the batch size
+    state = sampler.batched_reset(4)
+    try:
+        sampler.batched_step(state, {'force': np.zeros(3)})
+        assert False, 'action with wrong batch size was accepted'
+    except RDDLInvalidActionError:
+        pass
+
+
+if __name__ == '__main__':
+    test_rollout_after_step()
+    test_rollout_matches_step()
+    test_rollout_checks_preconditions()
+    test_invalid_batched_actions()
+    print('all tests passed')